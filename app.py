@@ -1,50 +1,171 @@
-from flask import Flask, request
-from twilio.twiml.messaging_response import MessagingResponse
-from handlers.commands import CommandHandler
+import asyncio
+import logging
+import os
+import sys
+from typing import Set
 
-# Prepare the instance of the Flask Application.
-app = Flask(__name__)
+# Use the libuv-based event loop where available, before the web stack is imported.
+if sys.platform != 'win32':
+    import uvloop
+    uvloop.install()
+
+import requests
+from quart import Quart, request
+from twilio.base.exceptions import TwilioRestException
+from twilio.rest import Client
+from handlers.commands import ERROR_RESPONSE, CommandHandler
+from handlers.parsing import parse_command
+from models.gemini import warmup
+from models.openai import close_session
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Prepare the instance of the Quart Application.
+app = Quart(__name__)
 command_handler = CommandHandler()
 
+# Twilio REST client, used to send replies once they are generated.
+twilio_client = Client(os.getenv('TWILIO_ACCOUNT_SID'), os.getenv('TWILIO_AUTH_TOKEN'))
+
+# Maximum number of messages being answered at once.
+WORKERS = int(os.getenv('BOT_WORKERS', '32'))
+slots = asyncio.Semaphore(WORKERS)
+
+# Seconds to keep answering queued messages on shutdown; they were already acknowledged,
+# so Twilio will not retry them. Keep it below Hypercorn's shutdown_timeout.
+DRAIN_TIMEOUT = float(os.getenv('BOT_DRAIN_TIMEOUT', '25'))
+
+# Pending (message sid, sender, recipient, command, message) jobs, and the sids being handled.
+# The sids are per process: with several workers, a retry that reaches another worker
+# is not recognised as a duplicate.
+jobs: asyncio.Queue = asyncio.Queue()
+in_flight: Set[str] = set()
+
+# The dispatcher and the answers it has started.
+tasks: Set[asyncio.Task] = set()
+
+# TwiML that sends no reply, returned as the immediate acknowledgement.
+_EMPTY_TWIML = '<?xml version="1.0" encoding="UTF-8"?><Response />'
+
+async def send(sid: str, sender: str, recipient: str, response: str):
+    """
+    Sends a generated response back to the sender through the Twilio REST API.
+
+    Parameters:
+        sid (str): The sid of the message being answered.
+        sender (str): The address the message came from.
+        recipient (str): The address the message was sent to.
+        response (str): The reply to send.
+    """
+    try:
+        # The Twilio client is blocking, keep it off the event loop.
+        await asyncio.to_thread(
+            twilio_client.messages.create, from_=recipient, to=sender, body=response
+        )
+    except (TwilioRestException, requests.RequestException):
+        logger.exception("An error occurred while replying to message '%s'.", sid)
+
+async def answer(sid: str, sender: str, recipient: str, first_word: str, message: str):
+    """
+    Generates the response to a single job and sends it back as soon as it is ready,
+    holding one of the `WORKERS` slots while doing so. If generating fails unexpectedly,
+    the error is logged and `ERROR_RESPONSE` is sent instead, so the user always gets a reply.
+
+    Parameters:
+        sid (str): The sid of the message being answered.
+        sender (str): The address the message came from.
+        recipient (str): The address the message was sent to.
+        first_word (str): The command keyword.
+        message (str): The message associated with the command.
+    """
+    try:
+        async with slots:
+            try:
+                response = await command_handler.handle_command(first_word, message)
+            except Exception:
+                logger.exception("An error occurred while answering message '%s'.", sid)
+                response = ERROR_RESPONSE
+
+            # Twilio rejects an empty body, so always answer something.
+            if not response:
+                response = ERROR_RESPONSE
+            await send(sid, sender, recipient, response)
+    finally:
+        in_flight.discard(sid)
+        jobs.task_done()
+
+async def dispatcher():
+    """
+    Takes jobs off the queue and starts answering each one right away, without
+    waiting for it; the event loop overlaps their model calls.
+    """
+    while True:
+        job = await jobs.get()
+        task = asyncio.create_task(answer(*job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+@app.before_serving
+async def startup():
+    """
+    Warms up the Gemini client and starts the background dispatcher once the server starts.
+    """
+    await warmup()
+    task = asyncio.create_task(dispatcher())
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+
+@app.after_serving
+async def shutdown():
+    """
+    Answers the messages still queued or in progress (for up to `DRAIN_TIMEOUT` seconds),
+    then stops the background tasks and releases the shared HTTP session of the models
+    once the server stops.
+    """
+    try:
+        await asyncio.wait_for(jobs.join(), DRAIN_TIMEOUT)
+    except TimeoutError:
+        logger.warning("Shutting down with messages still unanswered.")
+
+    pending = list(tasks)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    await close_session()
+
 @app.route('/bot', methods=['POST'])
-def bot():
+async def bot():
     
     """
     Handles incoming messages via a POST request to the '/bot' route.
     Extracts the first word of the incoming message to use as a command keyword
-    and dispatches the command to the CommandHandler for processing.
+    and queues the command for the background dispatcher, acknowledging right away.
+    The reply is sent separately once it is generated. Retries of a message that
+    is still being handled are ignored.
     
     Parameters:
-        None, but expects a POST request containing a 'Body' field with the incoming message.
+        None, but expects a POST request containing 'Body', 'From', 'To' and 'MessageSid' fields.
 
     Returns:
-        A TwiML response with the command processing result to be sent back to the sender.
+        An empty TwiML response.
     """
     
-    try:
-
-        # Get the whole message that is send by the user.
-        incoming_msg = request.values.get('Body', '')
-
-        # Extract the first word.
-        first_word = str(incoming_msg.split()[0]).lower()
-
-        # Message of the user.
-        message = ' '.join(incoming_msg.split()[1:])
-
-        # Get the response.
-        response = command_handler.handle_command(first_word, message)
+    # Get the whole message that is send by the user.
+    values = await request.values
+    incoming_msg = values.get('Body', '')
 
-        # Prepare & return the response back to WhatsApp.
-        resp = MessagingResponse()
-        msg = resp.message()
-        msg.body(response)
-        return str(resp)
+    # Split off the first word (the command) from the message of the user.
+    parsed = parse_command(incoming_msg)
+    if parsed is None:
+        return _EMPTY_TWIML
+    first_word, message = parsed
 
-    # Handle any errors.
-    except Exception as e:
-        print(f"An error occurred while processing the request: {e}")
-        return str(MessagingResponse().message("Sorry, an error occurred while processing your request."))
+    # Queue the command, unless this is a retry of a message already being handled.
+    sid = values.get('MessageSid')
+    if not sid or sid not in in_flight:
+        if sid:
+            in_flight.add(sid)
+        await jobs.put((sid, values.get('From', ''), values.get('To', ''), first_word, message))
 
-if __name__ == '__main__':
-    app.run(debug=True)
+    return _EMPTY_TWIML
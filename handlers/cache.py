@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import List, Optional
+import numpy as np
+
+class SemanticCache:
+    """
+    An in-memory cache that returns a stored response when a new question is close
+    enough, by cosine similarity, to a question seen before.
+
+    Embeddings are kept L2-normalized in a preallocated matrix, so a lookup is a single
+    matrix-vector product. Once `maxsize` entries are stored, the oldest entry is
+    overwritten first (FIFO). Entries older than `ttl` seconds are never returned.
+
+    Attributes:
+        threshold (float): The minimum cosine similarity that counts as a hit.
+        maxsize (int): The maximum number of stored entries.
+        ttl (float): The number of seconds an entry stays valid.
+
+    Methods:
+        get(embedding: np.ndarray) -> Optional[str]:
+            Returns the response of the most similar stored question, if any is close enough.
+        put(embedding: np.ndarray, response: str) -> None:
+            Stores a response under the given embedding.
+    """
+
+    def __init__(self, dimension: int, threshold: float = 0.92, maxsize: int = 10_000,
+                 ttl: float = 3600):
+        """
+        Initializes an empty SemanticCache.
+
+        Parameters:
+            dimension (int): The length of the embedding vectors.
+            threshold (float): The minimum cosine similarity that counts as a hit.
+            maxsize (int): The maximum number of stored entries.
+            ttl (float): The number of seconds an entry stays valid.
+        """
+
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._emb_matrix = np.zeros((maxsize, dimension), dtype=np.float32)
+        self._responses: List[Optional[str]] = [None] * maxsize
+        self._stored_at = np.zeros(maxsize, dtype=np.float64)
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self, embedding: np.ndarray) -> Optional[str]:
+        """
+        Looks up the response of the stored question most similar to the given one.
+
+        Parameters:
+            embedding (np.ndarray): The L2-normalized embedding of the question.
+
+        Returns:
+            Optional[str]: The cached response, or None if nothing is similar enough.
+        """
+
+        with self._lock:
+            if not self._size:
+                return None
+            sims = self._emb_matrix[:self._size] @ embedding
+            sims[self._stored_at[:self._size] < time.monotonic() - self.ttl] = -np.inf
+            best = int(sims.argmax())
+            if sims[best] > self.threshold:
+                return self._responses[best]
+        return None
+
+    def put(self, embedding: np.ndarray, response: str) -> None:
+        """
+        Stores the response under the given embedding, evicting the oldest entry
+        when the cache is full.
+
+        Parameters:
+            embedding (np.ndarray): The L2-normalized embedding of the question.
+            response (str): The response to cache.
+        """
+
+        with self._lock:
+            self._emb_matrix[self._next] = embedding
+            self._responses[self._next] = response
+            self._stored_at[self._next] = time.monotonic()
+            self._next = (self._next + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
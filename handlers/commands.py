@@ -1,116 +1,160 @@
-import os
-from typing import Callable, Dict, Union
+import asyncio
+import functools
+import hashlib
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, Union
+import aiohttp
+import orjson
+from cachetools import TTLCache
+from google.api_core.exceptions import GoogleAPIError
+from google.auth.exceptions import GoogleAuthError
+from google.generativeai.types import BlockedPromptException, StopCandidateException
+from handlers.cache import SemanticCache
+from interfaces.model import ModelResponseError, PromptTooLongError
+from models import embedding, gemini, openai
+from models.embedding import EmbeddingModel
 from models.gemini import GeminiModel
 from models.openai import OpenaiModel
 
+logger = logging.getLogger(__name__)
+
+# Errors the models are expected to raise when a response cannot be generated.
+MODEL_ERRORS = (
+    aiohttp.ClientError,
+    TimeoutError,
+    orjson.JSONDecodeError,
+    GoogleAPIError,
+    GoogleAuthError,
+    BlockedPromptException,
+    StopCandidateException,
+    ModelResponseError,
+)
+
+# Reply sent when a response could not be generated.
+ERROR_RESPONSE = "An error occurred while processing your command."
+
 class CommandHandler:
     """
     A class to handle various commands, dispatching them to the appropriate models
     for response generation. This class manages the mapping between command keywords
-    and their respective handler methods, facilitating the extension and maintenance
-    of command handling capabilities.
+    and the (cached) response generation of their models, facilitating the extension
+    and maintenance of command handling capabilities.
 
     Attributes:
-        commands (Dict[str, Callable[[str], str]]): A dictionary mapping command strings
-            to their handling methods, allowing dynamic command processing.
         models (Dict[str, Union[GeminiModel, OpenaiModel]]): A dictionary mapping model
             identifiers to their initialized instances. This allows easy access and command
             dispatching to different generative models based on the provided command.
+        embedder (EmbeddingModel): The model used to embed messages for the semantic cache.
+        stats (Dict[str, int]): Hit and miss counters of the response cache.
 
     Methods:
         handle_command(command: str, message: str) -> str:
-            Dispatches the command to its handler method and returns the response.
-        handle_gemini(message: str) -> str:
-            Handles commands directed to the Gemini model.
-        handle_openai(message: str) -> str:
-            Handles commands directed to the OpenAI model.
-        handle_default(message: str) -> str:
-            Provides a default response for unrecognized commands.
+            Dispatches the command to its model and returns the response.
     """
 
-    def __init__(self):
+    __slots__ = (
+        "_dispatch", "models", "embedder", "stats",
+        "_cache", "_cache_lock", "_semantic_caches"
+    )
+
+    def __init__(self) -> None:
         """
         Initializes the CommandHandler with mappings between commands and their handlers,
-        as well as initializing the required models with their API keys.
+        as well as getting the process-wide instances of the required models.
         """
-        self.commands: Dict[str, Callable[[str], str]] = {
-            "gemini": self.handle_gemini,
-            "openai": self.handle_openai
-        }
         self.models: Dict[str, Union[GeminiModel, OpenaiModel]] = {
-            "gemini": GeminiModel(api_key=os.getenv('GEMINI_API_KEY')),
-            "openai": OpenaiModel(api_key=os.getenv('OPENAI_API_KEY'))
+            "gemini": gemini.get_model(),
+            "openai": openai.get_model()
+        }
+
+        # Exact-match cache of generated responses, so repeated prompts skip the API call.
+        self._cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+        self._cache_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+        # Near-match cache per model, so paraphrased prompts also skip the API call.
+        # Entries expire after the same hour as the exact-match cache.
+        self.embedder: EmbeddingModel = embedding.get_model()
+        self._semantic_caches: Dict[str, SemanticCache] = {
+            key: SemanticCache(dimension=self.embedder.dimension, ttl=3600) for key in self.models
+        }
+
+        # Command keyword -> cached response generation of its model, built once.
+        self._dispatch: Dict[str, Callable[[str], Awaitable[str]]] = {
+            key: functools.partial(self._cached, key) for key in self.models
         }
 
-    def handle_command(self, command: str, message: str) -> str:
+    async def handle_command(self, command: str, message: str) -> str:
         """
-        Dispatches the command to its respective handler method based on the command keyword.
-        If the command is unrecognized, it defaults to the `handle_default` method.
+        Dispatches the command to its model based on the command keyword.
+        If the command is unrecognized, it defaults to the `_default` method.
 
         Parameters:
             command (str): The command keyword to identify the handler.
             message (str): The full message or query associated with the command.
 
         Returns:
-            str: The response generated by the command's handler method.
+            str: The response generated by the command's model.
         """
-        handler = self.commands.get(command, self.handle_default)
         try:
-            return handler(message)
-        except Exception as e:
+            return await self._dispatch.get(command, self._default)(message)
+        except PromptTooLongError as e:
+            # Tell the user, this rejection is never cached.
+            return str(e)
+        except MODEL_ERRORS:
             # Log and handle any error that occurs during command handling.
-            print(f"Error handling command '{command}': {e}")
-            return "An error occurred while processing your command."
+            logger.exception("Error handling command '%s'.", command)
+            return ERROR_RESPONSE
 
-    def handle_gemini(self, message: str) -> str:
+    async def _default(self, message: str) -> str:
         """
-        Handles commands specifically directed to the Gemini model, generating a response
-        based on the input message.
+        Provides a default response for unrecognized commands. This method acts as a fallback
+        for any command not explicitly handled by the `_dispatch` mapping.
 
         Parameters:
-            message (str): The message or question to be processed by the Gemini model.
+            message (str): The message associated with the unrecognized command.
 
         Returns:
-            str: The response generated by the Gemini model.
-        """
-        model = self.models.get("gemini")
-        if model:
-            try:
-                return model.generate_response(message)
-            except Exception as e:
-                print(f"Error generating response with Gemini model: {e}")
-                return "An error occurred while generating a response."
-        return "Gemini model is not available."
-
-    def handle_openai(self, message: str) -> str:
+            str: A default response indicating the command was not understood.
         """
-        Handles commands specifically directed to the OpenAI model, generating a response
-        based on the input message.
-
-        Parameters:
-            message (str): The message or question to be processed by the OpenAI model.
+        return "Sorry, I didn't understand that command."
 
-        Returns:
-            str: The response generated by the OpenAI model.
+    async def _cached(self, model_key: str, message: str) -> str:
         """
-        model = self.models.get("openai")
-        if model:
-            try:
-                return model.generate_response(message)
-            except Exception as e:
-                print(f"Error generating response with OpenAI model: {e}")
-                return "An error occurred while generating a response."
-        return "OpenAI model is not available."
-
-    def handle_default(self, message: str) -> str:
-        """
-        Provides a default response for unrecognized commands. This method acts as a fallback
-        for any command not explicitly handled by the `commands` mapping.
+        Returns the cached response for the given model and message, generating and
+        caching it on a miss. Exact matches are looked up first, then semantically
+        similar messages. Empty responses and failed generations are never cached.
 
         Parameters:
-            message (str): The message associated with the unrecognized command.
+            model_key (str): The identifier of the model in `models`.
+            message (str): The message or question to be processed by the model.
 
         Returns:
-            str: A default response indicating the command was not understood.
+            str: The cached or freshly generated response.
         """
-        return "Sorry, I didn't understand that command."
+        key = hashlib.sha256(f"{model_key}\0{message}".encode()).hexdigest()
+        with self._cache_lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self.stats["hits"] += 1
+                return response
+
+        # Embedding is CPU-bound, keep it off the event loop.
+        vector = await asyncio.to_thread(self.embedder.embed, message)
+        response = self._semantic_caches[model_key].get(vector)
+        if response is not None:
+            # Not written back to the exact-match cache, which would extend its lifetime.
+            with self._cache_lock:
+                self.stats["hits"] += 1
+            return response
+
+        with self._cache_lock:
+            self.stats["misses"] += 1
+
+        response = await self.models[model_key].generate_response(message)
+        if response:
+            with self._cache_lock:
+                self._cache[key] = response
+            self._semantic_caches[model_key].put(vector, response)
+        return response
@@ -0,0 +1,17 @@
+from typing import Optional, Tuple
+
+def parse_command(body: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits an incoming message into its command keyword (the first word, lowercased)
+    and the rest of the message, stripped of surrounding whitespace.
+
+    Parameters:
+        body (str): The whole message sent by the user.
+
+    Returns:
+        Optional[Tuple[str, str]]: The (command, message) pair, or None if the body is empty.
+    """
+    parts = body.split(maxsplit=1)
+    if not parts:
+        return None
+    return parts[0].lower(), parts[1].strip() if len(parts) > 1 else ''
@@ -1,3 +1,15 @@
+class PromptTooLongError(Exception):
+    """
+    Raised by a model when the question exceeds the number of tokens it accepts.
+    The message is meant to be shown to the user as is.
+    """
+
+class ModelResponseError(Exception):
+    """
+    Raised by a model when the API answered, but not in the expected shape
+    (e.g. missing fields, or a candidate without text).
+    """
+
 class ModelInterface:
     """
     Interface that serves as a template for generative models like Gemini & OpenAI.
@@ -11,9 +23,9 @@ class ModelInterface:
             Generates a response based on the input question.
     """
 
-    def generate_response(self, question: str) -> str:
+    async def generate_response(self, question: str) -> str:
         """
-        Generates a response to the given question. This method should be implemented
+        Generates a response to the given question. This coroutine should be implemented
         by subclasses to return a meaningful response based on the model's capabilities.
 
         Parameters:
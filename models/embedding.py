@@ -0,0 +1,55 @@
+import numpy as np
+from sentence_transformers import SentenceTransformer
+import functools
+import os
+
+class EmbeddingModel:
+    """
+    A thin wrapper around a local sentence-transformers model that turns text into
+    L2-normalized embedding vectors, used to detect semantically similar questions.
+
+    Attributes:
+        model (str): The sentence-transformers model identifier.
+        dimension (int): The length of the produced embedding vectors.
+
+    Methods:
+        embed(text: str) -> np.ndarray:
+            Returns the L2-normalized embedding of the given text.
+    """
+
+    def __init__(self):
+        """
+        Initializes the EmbeddingModel and loads the model weights.
+        Get the model, else use default - all-MiniLM-L6-v2 (384 dimensions).
+        """
+
+        self.model = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+        self._encoder = SentenceTransformer(self.model)
+        self.dimension = self._encoder.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Generates the embedding of the given text.
+
+        Parameters:
+            text (str): The text to embed.
+
+        Returns:
+            np.ndarray: A float32 vector of length `dimension` with unit L2 norm.
+        """
+
+        vector = self._encoder.encode(text, convert_to_numpy=True).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector
+
+@functools.lru_cache(maxsize=1)
+def get_model() -> EmbeddingModel:
+    """
+    Returns the process-wide EmbeddingModel, creating it on first use so every caller
+    in the process shares one instance.
+
+    Returns:
+        EmbeddingModel: The shared model instance.
+    """
+
+    return EmbeddingModel()
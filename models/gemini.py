@@ -1,6 +1,12 @@
 import google.generativeai as genai
-from interfaces.model import ModelInterface
+from interfaces.model import ModelInterface, ModelResponseError, PromptTooLongError
+import contextlib
+import functools
+import logging
 import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
 
 class GeminiModel(ModelInterface):
     """
@@ -12,42 +18,58 @@ class GeminiModel(ModelInterface):
 
     Attributes:
         api_key (str): The API key used to authenticate requests to the Gemini API.
+        max_words (int): The number of words after which the streamed response is cut off.
+        max_prompt_tokens (int): The maximum number of tokens accepted in a question.
 
     Methods:
         generate_response(question: str) -> str:
             Generates a response to a given question using the Gemini generative model.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Optional[str]):
         """
         Initializes the GeminiModel with the necessary API key for authentication.
-        Get the model that should be used for Generating response.
+        Get the model that should be used for Generating response, else use default - gemini-1.5-flash.
         Set the word limit of teh response - 100
+        Streamed responses are cut off once they run past twice the word limit.
+        Questions longer than 1024 tokens are rejected.
+        Prepare the generative model once, with the static instruction as its system
+        instruction, so only the question varies between requests.
 
         Parameters:
             api_key (str): The API key for accessing the Gemini generative AI service.
         """
         
         self.api_key = api_key
-        self.model = os.getenv('GEMINI_MODEL')
+        self.model = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
         self.word_limit = 100
+        self.max_words = self.word_limit * 2
+        self.max_prompt_tokens = 1024
+        self._instruction = f'Answer the question in {self.word_limit} words.'
         
         try:
             genai.configure(api_key=self.api_key)
-        except Exception as e:
+
+            # Prepare the model instance once, it is reused for every request. The static
+            # instruction leads every prompt, so the provider can cache it as a prefix.
+            self._model = genai.GenerativeModel(self.model, system_instruction=self._instruction)
+        except Exception:
             
             # Handle exceptions related to API configuration errors.
-            print(f"Failed to configure Gemini API with provided API key: {e}")
+            logger.exception("Failed to configure Gemini API with provided API key.")
             
             # Optionally, re-raise the exception if the application cannot recover.
             raise
 
-    def generate_response(self, question: str) -> str:
+    async def generate_response(self, question: str) -> str:
         """
         Generates a response to the given question using the Gemini model.
 
         This method calls the Gemini generative AI service to generate a response
-        to the input question, handling any potential errors during the process.
+        to the input question. Errors are left to the caller.
+        Questions longer than `max_prompt_tokens` are rejected without generating.
+        The response is streamed and accumulated as it arrives, stopping early
+        once it exceeds `max_words`.
 
         Parameters:
             question (str): The question to generate a response for.
@@ -56,21 +78,66 @@ class GeminiModel(ModelInterface):
             str: The generated response to the question.
 
         Raises:
-            Exception: If there is an error in generating the response from the Gemini model.
+            PromptTooLongError: If the question is longer than `max_prompt_tokens`.
+            GoogleAPIError: If the Gemini API request fails.
+            BlockedPromptException: If the question was blocked.
+            StopCandidateException: If the generation stopped abnormally.
+            ModelResponseError: If a streamed chunk carries no text.
         """
 
-        try:
-            # Prepare the model instance.
-            model = genai.GenerativeModel(self.model)
+        # A token spans at least one byte, so only long questions need to be counted.
+        if len(question.encode()) > self.max_prompt_tokens:
+            count = await self._model.count_tokens_async(question)
+            if count.total_tokens > self.max_prompt_tokens:
+                raise PromptTooLongError(
+                    f'Your question is too long, please keep it under {self.max_prompt_tokens} tokens.'
+                )
 
-            # Get the content and return it.
-            response = model.generate_content(f'Answer this question in {self.word_limit} words: ' + question)
-            return response.text
+        # Stream the content and return it.
+        response = await self._model.generate_content_async(question, stream=True)
+        parts = []
+        words = 0
+        # Finalize the stream iterator right away when stopping early.
+        async with contextlib.aclosing(aiter(response)) as chunks:
+            async for chunk in chunks:
+                try:
+                    text = chunk.text
+                except ValueError as e:
+                    # The SDK raises ValueError when a candidate carries no text.
+                    raise ModelResponseError(f"Gemini returned no text: {e}") from e
+                parts.append(text)
+                words += len(text.split())
+                if words > self.max_words:
+                    break
+        return ''.join(parts).strip()
 
-        except Exception as e:
-            
-            # Handle exceptions related to the model generation process.
-            print(f"Error generating response from Gemini model: {e}")
-            
-            # Optionally, re-raise the exception if the application cannot recover.
-            raise
+@functools.lru_cache(maxsize=1)
+def get_model() -> GeminiModel:
+    """
+    Returns the process-wide GeminiModel, creating it on first use so every caller
+    in the process shares one instance.
+
+    Returns:
+        GeminiModel: The shared model instance.
+    """
+
+    return GeminiModel(api_key=os.getenv('GEMINI_API_KEY'))
+
+async def warmup() -> None:
+    """
+    Loads the Gemini SDK internals ahead of the first request, so the cold-start cost
+    is paid at server start rather than by the first user. Enabled with GEMINI_WARMUP=1.
+    """
+
+    if os.getenv('GEMINI_WARMUP') != '1':
+        return
+
+    try:
+        # Pull in the lazily imported SDK types.
+        from google.generativeai.types import HarmCategory
+        list(HarmCategory)
+
+        # One cheap round trip sets up the async client the requests use.
+        await get_model()._model.count_tokens_async('hi')
+    except Exception:
+        logger.warning("Gemini warm-up failed.", exc_info=True)
@@ -1,6 +1,44 @@
-import requests
-from interfaces.model import ModelInterface
+import asyncio
+import aiohttp
+import orjson
+import tiktoken
+from interfaces.model import ModelInterface, ModelResponseError
+import functools
 import os
+from typing import Optional
+
+# Session shared by every OpenaiModel instance, so connections (and TLS) are reused.
+_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared HTTP session, creating it on first use. It is created lazily,
+    as it has to be bound to a running event loop.
+
+    Returns:
+        aiohttp.ClientSession: The session used for all OpenAI API calls.
+    """
+
+    global _session
+    if _session is None or _session.closed:
+        # No global cap, only a per-host one, and long-lived keep-alive connections.
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=100,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            )
+        )
+    return _session
+
+async def close_session() -> None:
+    """
+    Closes the shared HTTP session, if it was ever opened.
+    """
+
+    if _session is not None and not _session.closed:
+        await _session.close()
 
 class OpenaiModel(ModelInterface):
     """
@@ -11,13 +49,16 @@ class OpenaiModel(ModelInterface):
         api_key (str): The API key used for authenticating requests to the OpenAI API.
         model (str): The model identifier for OpenAI's API.
         word_limit (int): The maximum number of words expected in the response.
+        max_words (int): The number of words after which the streamed response is cut off.
+        timeout (int): The number of seconds to wait for a response.
+        max_prompt_tokens (int): The number of tokens the question is truncated to.
 
     Methods:
         generate_response(question: str) -> str:
             Generates a response to a given question using the specified OpenAI model.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Optional[str]):
         """
         Initializes the OpenaiModel with the necessary API key and model details.
 
@@ -27,49 +68,104 @@ class OpenaiModel(ModelInterface):
         
         self.api_key = api_key
 
-        # Get the model, else use default - gpt-3.5-turbo-instruct.
-        self.model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo-instruct')
+        # Get the model, else use default - gpt-3.5-turbo.
+        self.model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
 
         # Max tokens that OpenAI should use.
         self.word_limit = 100
 
-    def generate_response(self, question: str) -> str:
+        # Stop reading the stream once the response runs this far past the word limit.
+        self.max_words = self.word_limit * 2
+
+        # Static instruction, sent first so the provider can cache it as a prompt prefix.
+        self._instruction = f'Answer the question in {self.word_limit} words.'
+
+        # Seconds to wait for a response before giving up.
+        self.timeout = 30
+
+        # Longer questions are truncated to this many tokens before being sent.
+        self.max_prompt_tokens = 1024
+        try:
+            self._enc = tiktoken.encoding_for_model(self.model)
+        except KeyError:
+            self._enc = tiktoken.get_encoding('cl100k_base')
+
+    async def generate_response(self, question: str) -> str:
         """
         Generates a response to the given question using the OpenAI API.
+        Questions longer than `max_prompt_tokens` are truncated first. The completion
+        is streamed and accumulated as it arrives, stopping early once it exceeds `max_words`.
 
         Parameters:
             question (str): The question to generate a response for.
 
         Returns:
-            str: The generated response to the question or None if an error occurs.
+            str: The generated response to the question.
 
         Raises:
-            Exception: Describes the exception if the API request fails.
+            aiohttp.ClientError: If the API request fails or returns an error status.
+            TimeoutError: If no complete response arrives within `timeout` seconds.
+            orjson.JSONDecodeError: If a streamed chunk is not valid JSON.
+            ModelResponseError: If a streamed chunk lacks the expected fields.
         """
         
-        try:
-            response = requests.post(
-                f'https://api.openai.com/v1/engines/{self.model}/completions',
-                json={
-                    'prompt': question,
-                    'max_tokens': self.word_limit * 5
-                },
-                headers={
-                    'Authorization': f'Bearer {self.api_key}'
-                }
-            )
+        # A token spans at least one byte, so only long questions need to be tokenized.
+        if len(question.encode()) > self.max_prompt_tokens:
+            question = self._enc.decode(self._enc.encode(question)[:self.max_prompt_tokens])
+
+        # Bound the whole call so stuck sockets don't pile up.
+        async with asyncio.timeout(self.timeout), _get_session().post(
+            'https://api.openai.com/v1/chat/completions',
+            data=orjson.dumps({
+                'model': self.model,
+                'messages': [
+                    {'role': 'system', 'content': self._instruction},
+                    {'role': 'user', 'content': question}
+                ],
+                'max_tokens': self.word_limit * 5,
+                'stream': True
+            }),
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json',
+                'Connection': 'keep-alive'
+            }
+        ) as response:
 
-            # Raises an HTTPError for bad responses.
+            # Raises a ClientResponseError for bad responses.
             response.raise_for_status()
 
-            return response.json()['choices'][0]['text'].strip()
-
-        except requests.exceptions.HTTPError as http_err:
-            
-            # Handle HTTP errors separately from other exceptions
-            print(f"HTTP error occurred: {http_err}")
-        except Exception as err:
-            
-            # Handle other errors like connection problems, request timeouts, etc.
-            print(f"An error occurred: {err}")
-        return None
+            chunks = []
+            words = 0
+
+            # Server-sent events, one 'data: {...}' line per chunk.
+            async for line in response.content:
+                if not line.startswith(b'data: '):
+                    continue
+                payload = line[6:].strip()
+                if payload == b'[DONE]':
+                    break
+                try:
+                    text = orjson.loads(payload)['choices'][0]['delta'].get('content')
+                except (KeyError, IndexError, TypeError, AttributeError) as e:
+                    raise ModelResponseError(f"Unexpected chunk from OpenAI: {payload!r}") from e
+                if not text:
+                    continue
+                chunks.append(text)
+                words += len(text.split())
+                if words > self.max_words:
+                    break
+
+            return ''.join(chunks).strip()
+
+@functools.lru_cache(maxsize=1)
+def get_model() -> OpenaiModel:
+    """
+    Returns the process-wide OpenaiModel, creating it on first use so every caller
+    in the process shares one instance.
+
+    Returns:
+        OpenaiModel: The shared model instance.
+    """
+
+    return OpenaiModel(api_key=os.getenv('OPENAI_API_KEY'))
@@ -0,0 +1,9 @@
+from hypercorn.config import Config
+from hypercorn.run import run
+
+# Starts the production server. The app module is only imported by the worker
+# processes, so the models are loaded once per worker and never in this supervisor.
+if __name__ == '__main__':
+    config = Config.from_toml('hypercorn.toml')
+    config.application_path = 'app:app'
+    run(config)
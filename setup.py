@@ -0,0 +1,14 @@
+from setuptools import setup
+from mypyc.build import mypycify
+
+# Compiles the per-request Python code (command parsing and dispatch) with mypyc.
+# Build in place with: python setup.py build_ext --inplace
+setup(
+    name='twilio-gemini-bot',
+    ext_modules=mypycify([
+        '--ignore-missing-imports',
+        '--follow-imports=silent',
+        'handlers/parsing.py',
+        'handlers/commands.py',
+    ]),
+)
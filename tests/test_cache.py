@@ -0,0 +1,36 @@
+import numpy as np
+from handlers.cache import SemanticCache
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_empty_cache_misses():
+    cache = SemanticCache(dimension=2)
+    assert cache.get(unit(1, 0)) is None
+
+def test_returns_most_similar_entry_above_threshold():
+    cache = SemanticCache(dimension=2, threshold=0.9)
+    cache.put(unit(1, 0), "x")
+    cache.put(unit(0, 1), "y")
+    assert cache.get(unit(1, 0.1)) == "x"
+    assert cache.get(unit(0.1, 1)) == "y"
+
+def test_below_threshold_misses():
+    cache = SemanticCache(dimension=2, threshold=0.9)
+    cache.put(unit(1, 0), "x")
+    assert cache.get(unit(1, 1)) is None
+
+def test_evicts_oldest_entry_first():
+    cache = SemanticCache(dimension=3, maxsize=2)
+    cache.put(unit(1, 0, 0), "a")
+    cache.put(unit(0, 1, 0), "b")
+    cache.put(unit(0, 0, 1), "c")
+    assert cache.get(unit(1, 0, 0)) is None
+    assert cache.get(unit(0, 1, 0)) == "b"
+    assert cache.get(unit(0, 0, 1)) == "c"
+
+def test_expired_entries_miss():
+    cache = SemanticCache(dimension=2, ttl=-1)
+    cache.put(unit(1, 0), "x")
+    assert cache.get(unit(1, 0)) is None
@@ -0,0 +1,18 @@
+from handlers.parsing import parse_command
+
+def test_empty_body():
+    assert parse_command("") is None
+    assert parse_command(" \n\t ") is None
+
+def test_command_only():
+    assert parse_command("Gemini") == ("gemini", "")
+
+def test_command_and_message():
+    assert parse_command("OPENAI what is x") == ("openai", "what is x")
+
+def test_any_whitespace_separates_the_command():
+    assert parse_command("gemini\nwhat is x") == ("gemini", "what is x")
+
+def test_message_is_stripped():
+    assert parse_command("  gemini   hi \n") == ("gemini", "hi")
+    assert parse_command("gemini hi") == parse_command("gemini hi ")